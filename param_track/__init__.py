@@ -8,3 +8,4 @@
 from .param_track import Parameters
 from importlib.metadata import version
 __version__ = version('param_track')
+__all__ = ['Parameters']
@@ -4,10 +4,23 @@
 
 
 """General simple parameter tracking module."""
-from .param_track_support import ParameterTrackError, Log, typemsg, check_serialize
+from .param_track_support import ParameterTrackError, Log, typemsg, keysmsg, check_serialize, yaml_plain_dump
+from .param_track_support import data_descriptors, _IMMUTABLE_TYPES, _EQUAL_SAME_TYPES, _YAML_DUMPER
 from .param_track_support import typename as tn
-from copy import copy
+from bisect import insort
+from sys import intern
+import json
+import pickle
+try:
+    import yaml
+except ImportError:
+    yaml = None
 from param_track import param_track_units
+from param_track.param_track_io import from_file, to_file
+from os.path import isfile
+
+
+_PT_OUTPUT_CACHE_SIZE = 16  # most outputs kept by _pt_store_cached (the full ones plus a few include_par subsets)
 
 
 class Parameters:
@@ -16,12 +29,21 @@ class Parameters:
     existence and of type.  See README.md
 
     """
-    _internal_only_ptvar = {'ptnote', 'ptstrict', 'pterr', 'ptverbose', 'pttype', 'pttypeerr', 'ptsetunits',
-                            '_pt_silent'
-                            '_internal_pardict'}
-    _internal_only_ptdef = {'ptset', '_pt_set', 'ptinit', 'ptadd', 'ptsu', 'ptfrom', 'ptget', 'ptdel',
-                            'ptexist', 'ptshow', 'ptlog', 'ptto', 'pt_to_dict',
-                            '__ptu__', '__log__'}
+    # Internal parameters and helpers are slotted, so __dict__ only holds the user parameters (__weakref__ kept for
+    # weakref support)
+    __slots__ = ('ptnote', 'ptstrict', 'pterr', 'ptverbose', 'pttype', 'pttypeerr', 'ptsetunits', '_pt_silent',
+                 '_internal_pardict', '_pt_sorted_keys', '_pt_version', '_pt_output_cache', '_pt_is_initialized',
+                 '__ptu__', '__log__', '__dict__', '__weakref__')
+    _internal_only_ptvar = frozenset({'ptnote', 'ptstrict', 'pterr', 'ptverbose', 'pttype', 'pttypeerr', 'ptsetunits',
+                                      '_pt_silent', '_internal_pardict', '_pt_sorted_keys', '_pt_version',
+                                      '_pt_output_cache', '_pt_is_initialized'})
+    _internal_only_ptdef = frozenset({'ptset', 'ptset_many', '_pt_set', '_pt_set_one', '_pt_set_items', 'ptinit',
+                                      'ptadd', '_pt_add_items', '_pt_add_new', 'ptsu', 'ptfrom', 'ptget', 'ptdel',
+                                      'ptexist', 'ptexists', 'ptshow', 'ptlog', 'ptto', 'pt_to_dict', '_pt_to_safe_dict',
+                                      '_pt_bulk_add', '_pt_check_init', '_pt_cached', '_pt_store_cached',
+                                      '__getstate__', '__setstate__', '__ptu__', '__log__'})
+    _internal_only_all = _internal_only_ptvar | _internal_only_ptdef  # single membership test (also a frozenset)
+    _internal_only_shown = tuple(sorted(x for x in _internal_only_ptvar if not x.startswith('_')))  # 'internal' output, presorted
 
 
     def __init__(self, ptnote='Parameter tracking class', ptinit=None,
@@ -63,6 +85,7 @@ class Parameters:
         Methods
         -------
         ptset : set parameters (with checking)
+        ptset_many : same as ptset, but given a dict
         ptinit : initialize parameters from a list of keys to default value or with a file ...
         ptadd : add new parameters (only way to add new parameters in strict mode)
         ptfrom : set parameters from a file (CSV, JSON or YAML formats supported, set by filename extension)
@@ -77,26 +100,81 @@ class Parameters:
 
         """
         self._internal_pardict = {}
+        self._pt_sorted_keys = None  # built on first sorted output, then kept sorted on add/delete
+        self._pt_version = 0  # bumped by the setting/deleting methods, used to invalidate cached output
+        self._pt_output_cache = {}  # output name -> (state, output), see _pt_cached
+        # the rest get the _pt_check_init defaults until ptsu below sets them, so it has nothing to check
+        self.ptnote, self.ptverbose = 'Uninitialized Parameter Tracking', True
+        self.ptstrict = self.pterr = self.pttype = self.pttypeerr = self.ptsetunits = self._pt_silent = False
+        self._pt_is_initialized = True
         self.__ptu__ = param_track_units.Units(__name__)
         self.__log__ = Log(__name__)
         from . import __version__
-        self.__log__.post(f"Parameter Track:  version {__version__}", silent=True)
-        self.__log__.post(f"Parameters tracking: {ptnote}.", silent=True)
+        self.__log__.post("Parameter Track:  version {}", silent=True, args=(__version__,))
+        self.__log__.post("Parameters tracking: {}.", silent=True, args=(ptnote,))
         if ptverbose and _pt_silent:  # Make sure if verbose is true that silent is off.
             _pt_silent = False
         self.ptsu(ptnote=ptnote, ptinit=ptinit, ptstrict=ptstrict, pterr=pterr, ptverbose=ptverbose,
                   pttype=pttype, pttypeerr=pttypeerr, _pt_silent=_pt_silent, ptsetunits=ptsetunits, **kwargs)
-        self._pt_is_initialized = True
+
+    def __getstate__(self):
+        """Pickle state: the parameters (instance __dict__) and the set slots, spelled out so every protocol works."""
+        slots = {name: getattr(self, name) for name in Parameters.__slots__
+                 if name not in ('__dict__', '__weakref__') and hasattr(self, name)}
+        return dict(self.__dict__), slots
+
+    def __setstate__(self, state):
+        params, slots = state
+        self.__dict__.update(params)
+        for name, val in slots.items():
+            setattr(self, name, val)
 
     def __repr__(self):
-        return self.ptshow(return_only=True)
+        """The ptshow string (cached, see _pt_cached)."""
+        state, show = self._pt_cached('repr')
+        if show is None:
+            show = self._pt_store_cached('repr', state, self.ptshow(return_only=True))
+        return show
+
+    def _pt_cached(self, name):
+        """
+        Return (state, output) for the cached output 'name', output is None if not cached or stale.
+
+        The output is valid while the version and the identity of every value (and ptnote) are unchanged.
+        Pass state back to _pt_store_cached when the output is regenerated.
+
+        """
+        state = (self._pt_version, self.ptnote, tuple(getattr(self, key, None) for key in self._internal_pardict))
+        cached = self._pt_output_cache.get(name)
+        if cached is not None:
+            old = cached[0]
+            if (old[0] == state[0] and old[1] is state[1] and len(old[2]) == len(state[2])
+                    and all(a is b for a, b in zip(old[2], state[2]))):
+                return state, cached[1]
+        return state, None
+
+    def _pt_store_cached(self, name, state, output):
+        """
+        Cache output under name for the state from _pt_cached and return it.
+
+        Only cached if all values are immutable scalars, so in-place changes can't make it stale.
+
+        """
+        cache = self._pt_output_cache
+        if all(type(val) in _IMMUTABLE_TYPES for val in state[2]):
+            if name not in cache and len(cache) >= _PT_OUTPUT_CACHE_SIZE:  # (subsets can add names) drop the oldest
+                del cache[next(iter(cache))]
+            cache[name] = (state, output)
+        else:
+            cache.pop(name, None)
+        return output
 
     def _pt_check_init(self):
         """
         This kluge makes it so that you don't have to run super().__init__() when used as a Parent.
         
         """
-        if hasattr(self, '_pt_is_initialized') and self._pt_is_initialized:
+        if getattr(self, '_pt_is_initialized', False):  # (only unset until the first check/end of __init__)
             return
         for chk in self._internal_only_ptvar:
             if not hasattr(self, chk):
@@ -105,14 +183,57 @@ class Parameters:
                 elif chk == 'ptverbose':
                     val = True
                 elif chk == '_internal_pardict':
-                    self._internal_pardict = {}
+                    val = {}
+                elif chk == '_pt_sorted_keys':
+                    val = None
+                elif chk == '_pt_version':
+                    val = 0
+                elif chk == '_pt_output_cache':
+                    val = {}
                 else:
                     val = False
                 setattr(self, chk, val)
         self._pt_is_initialized = True       
 
+    def _pt_bulk_add(self, kwargs):
+        """
+        Fast path used by ptsu (so also __init__), ptinit and ptadd for the parameters when not verbose and not using
+        units.  The callers have already dropped/excluded the internal keys, so kwargs must not contain any.
+
+        Same result as ptadd, but stores directly into the instance __dict__ and the type tracking with one summary
+        log entry instead of going through Units.setattr per key.
+
+        """
+        self._pt_version += 1
+        d = self.__dict__
+        pardict = self._internal_pardict
+        cls = type(self)
+        direct = cls.__setattr__ is object.__setattr__  # else a custom __setattr__ has to see every key
+        described = data_descriptors(cls).intersection(kwargs) if direct else None  # e.g. properties, use setattr
+        sorted_keys = self._pt_sorted_keys
+        if direct and not described and pardict.keys().isdisjoint(kwargs):  # all new (e.g. __init__), no checks
+            new = {intern(key): val for key, val in kwargs.items()}  # stored names are interned (see below)
+            d.update(new)
+            pardict.update({key: None if val is None else type(val) for key, val in new.items()})
+            if sorted_keys is not None:
+                sorted_keys.extend(new)
+                sorted_keys.sort()
+        else:
+            _insort = insort  # module global bound to a local for the loop
+            for key, val in kwargs.items():
+                if key not in pardict:
+                    key = intern(key)  # stored names are interned so later lookups hit on identity
+                    if sorted_keys is not None:
+                        _insort(sorted_keys, key)
+                if not direct or key in described:
+                    setattr(self, key, val)
+                else:
+                    d[key] = val
+                pardict[key] = None if val is None else type(val)
+        self.__log__.post(keysmsg, silent=True, args=("Adding parameters ", tuple(kwargs)))  # (joined only if read)
+
     def ptexists(self, key):
-        return key in self._internal_pardict.keys()
+        return key in self._internal_pardict
 
     def ptinit(self, ptinit=[], default=None, **kwargs):
         """
@@ -147,17 +268,15 @@ class Parameters:
         if ptinit is None:
             return
         if isinstance(ptinit, str):
-            inp = ptinit.split(':')
-            from os.path import isfile
-            if isfile(inp[0]):
-                use_key = inp[1] if len(inp) > 1 else None
-                self.ptfrom(inp[0], use_key=use_key, use_option='su', as_row=False)
+            filename, sep, use_key = ptinit.partition(':')  # filename[:key]
+            if isfile(filename):
+                self.ptfrom(filename, use_key=use_key if sep else None, use_option='su', as_row=False)
                 return
             else:
                self.__log__.post(f"Processing {ptinit} as a csv-list", silent=False)  # To forestall confusion of not finding a file...
-               data = {x.strip(): default for x in ptinit.split(',')}
+               data = dict.fromkeys([x.strip() for x in ptinit.split(',')], default)
         elif isinstance(ptinit, list):
-            data = {key: default for key in ptinit}
+            data = dict.fromkeys(ptinit, default)
         elif isinstance(ptinit, dict):
             data = ptinit
         else:
@@ -165,8 +284,14 @@ class Parameters:
                          f"got {ptinit} ({tn(ptinit)})", silent=self._pt_silent)  # always print 'ignored'
             return
         self.__log__.post(f"Initializing parameters from {ptinit}", silent=not self.ptverbose)
-        data.update(kwargs)
-        self.ptsu(**data)
+        if kwargs:
+            data = {**data, **kwargs}  # (not update, data may be the caller's ptinit dict)
+        cls = type(self)
+        if (self.ptverbose or self.__ptu__.use_units or not data.keys().isdisjoint(cls._internal_only_all)
+                or cls.ptsu is not Parameters.ptsu or cls.ptadd is not Parameters.ptadd):  # (redefined ones are used)
+            self.ptsu(**data)
+        else:  # what ptsu would do with these (e.g. a list of keys all set to None), without the unpacking/checks
+            self._pt_bulk_add(data)
 
     def ptset(self, **kwargs):
         """
@@ -177,7 +302,8 @@ class Parameters:
         or 'update'.
         
         See the method _pt_set for the behavior.  The methods ptadd and ptsu provide for other ways to intereact
-        with the parameters.
+        with the parameters.  Note that setting an existing parameter to its current value is skipped and only
+        logged as "Parameter '<key>' unchanged." (printed if ptverbose).
         
         ptinit is also available for initialization (meant to be called once on startup).
         ptfrom will add variables from a file
@@ -185,12 +311,24 @@ class Parameters:
         """
         self._pt_set(**kwargs)
 
+    def ptset_many(self, items):
+        """
+        Set parameters from the dict items, same as ptset(**items) without unpacking and repacking the dict.
+
+        Note that this goes directly to _pt_set (i.e. a redefined ptset is not used).
+
+        """
+        self._pt_set_items(items)
+
     def _pt_set(self, **kwargs):
         """
         This is the standard way to set parameters (see also ptadd and ptsu).
 
         Behavior:
         - if the parameter is one of the internal ones (_internal_only_ptvar, _internal_only_ptdef) the request is IGNORED
+        - if the parameter already exists and the value is unchanged (the same object, or an equal int/str/bytes/bool
+          of the same type) and so is its recorded type, nothing is set or type-checked, it is just logged as
+          "Parameter '<key>' unchanged." (printed if ptverbose)
         - if the parameter already exists, the value is set, followed by type-checking per below:
             - if the value is None, type checking is IGNORED
             - if the preexisting type is None, then the type is reset silently to the type of value
@@ -206,36 +344,115 @@ class Parameters:
                 - if pterr is False, a warning is printed and the request is IGNORED
             if ptstrict is False, the value and type are set
 
+        Keys are first sorted into internal/existing/new groups, which are then handled in that order (so an unknown
+        key raising in strict mode does so before any parameter is set).
+
         """
+        self._pt_set_items(kwargs)
+
+    def _pt_set_one(self, key, val):
+        """Set the single parameter key to val (see _pt_set for the behavior), without the grouping and batching."""
         self._pt_check_init()
-        for key, val in kwargs.items():
-            if key in self._internal_only_ptvar or key in self._internal_only_ptdef:
-                self.__log__.post(f"Attempt to set internal parameter/method '{key}' -- ignored, try method 'ptsu'.", silent=self._pt_silent)  # always print 'ignored'
-            elif key in self._internal_pardict:  # It has a history, so set and then check type.
-                self.__ptu__.setattr(self, key, val)
-                self.__log__.post(f"Setting existing parameter {self.__ptu__.msg}", silent=not self.ptverbose)
+        self._pt_version += 1
+        if key in type(self)._internal_only_all:  # Internal only, so ignore.
+            self.__log__.post("Attempt to set internal parameter/method '{}' -- ignored, try method 'ptsu'.",
+                              silent=self._pt_silent, args=(key,))  # always print 'ignored'
+            return
+        pardict = self._internal_pardict
+        if key not in pardict:
+            if not self.ptstrict:  # New parameter and not in strict mode so just set it.
+                self._pt_add_new(key, val, "Setting new parameter ")
+            elif self.pterr:
+                raise ParameterTrackError(f"Unknown parameter '{key}' in strict mode.")
+            else:
+                self.__log__.post("Unknown parameter '{}' in strict mode -- ignored.  Use 'ptadd' to add new parameters.",
+                                  silent=self._pt_silent, args=(key,))  # always print 'ignored'
+            return
+        ptu, post, quiet = self.__ptu__, self.__log__.post, not self.ptverbose
+        if not ptu.use_units:  # (with units, the stored value may not be converted yet)
+            params = self.__dict__
+            if key in params:
+                old, vt = params[key], type(val)
+                if pardict[key] is vt and (old is val or (type(old) is vt and vt in _EQUAL_SAME_TYPES and old == val)):
+                    post("Parameter '{}' unchanged.", silent=quiet, args=(key,))  # so nothing to set or check
+                    return
+        ptu.setattr(self, key, val)
+        ptu.post_msg(post, "Setting existing parameter ", silent=quiet)
+        if val is None:  # A value of None ignores types
+            return
+        vtype, stored = ptu.type, pardict[key]
+        if stored is None:  # None always gets updated type
+            pardict[key] = vtype
+        elif vtype is not stored:  # Types don't match
+            if self.pttype:  # ... and I care about types.
+                if self.pttypeerr:
+                    raise ParameterTrackError(typemsg(key, stored, vtype, 'raise'))
+                post(typemsg, silent=self._pt_silent, args=(key, stored, vtype, 'retain'))  # since I care about types
+            else:  # ... but I don't care about types.
+                pardict[key] = vtype
+                post(typemsg, silent=quiet, args=(key, stored, vtype, 'reset'))
+
+    def _pt_set_items(self, kwargs):
+        """Set the parameters in the dict kwargs (see _pt_set for the behavior)."""
+        if len(kwargs) <= 1:
+            for key, val in kwargs.items():  # a single key needs no grouping or batching
+                self._pt_set_one(key, val)
+            return
+        self._pt_check_init()
+        self._pt_version += 1
+        reserved = kwargs.keys() & type(self)._internal_only_all  # classify internal keys in one C-level pass
+        pardict = self._internal_pardict
+        existing, new = [], []  # classify all keys first, then handle each group in its own loop
+        for item in kwargs.items():
+            if item[0] in pardict:
+                existing.append(item)
+            elif not (reserved and item[0] in reserved):
+                new.append(item)
+        if reserved:  # logged in kwargs order
+            self.__log__.extend("Attempt to set internal parameter/method '{}' -- ignored, try method 'ptsu'.",
+                                [(key,) for key in kwargs if key in reserved], silent=self._pt_silent)  # always print 'ignored'
+        if new and self.ptstrict:  # Keys are unknown and strict mode is on (so checked before anything is set).
+            if self.pterr:
+                raise ParameterTrackError(f"Unknown parameter '{new[0][0]}' in strict mode.")
+            self.__log__.extend("Unknown parameter '{}' in strict mode -- ignored.  Use 'ptadd' to add new parameters.",
+                                [(key,) for key, _ in new], silent=self._pt_silent)  # always print 'ignored'
+            new = []
+        ptu, params = self.__ptu__, self.__dict__  # instance lookups done once for the loops
+        ptu_set, ptu_post, use_units = ptu.setattr, ptu.post_msg, ptu.use_units  # (bound once, not per key)
+        quiet, typechk, typeerr, pt_silent = not self.ptverbose, self.pttype, self.pttypeerr, self._pt_silent
+        records = []  # posts for the existing keys, handed to the log in one go
+
+        def post(message, silent=False, args=()):
+            records.append((message, args, silent))
+
+        try:
+            for key, val in existing:  # It has a history, so set and then check type.
+                if not use_units and key in params:  # (with units, the stored value may not be converted yet)
+                    old, vt = params[key], type(val)
+                    if pardict[key] is vt and (old is val or (type(old) is vt and vt in _EQUAL_SAME_TYPES and old == val)):
+                        post("Parameter '{}' unchanged.", silent=quiet, args=(key,))  # so nothing to set or check
+                        continue
+                ptu_set(self, key, val)
+                ptu_post(post, "Setting existing parameter ", silent=quiet)
                 if val is None:  # A value of None ignores types
                     continue
-                elif self._internal_pardict[key] is None:  # None always gets updated type
-                    self._internal_pardict[key] = copy(self.__ptu__.type)
-                elif type(val) != self._internal_pardict[key]:  # Types don't match
-                    if self.pttype:  # ... and I care about types.
-                        if self.pttypeerr:
-                            raise ParameterTrackError(typemsg(key, self._internal_pardict[key], self.__ptu__.tn, 'raise'))
+                vtype = ptu.type  # type as stored (i.e. after any unit conversion)
+                stored = pardict[key]
+                if stored is None:  # None always gets updated type
+                    pardict[key] = vtype  # types are immutable, so no copy needed
+                elif vtype is not stored:  # Types don't match (types are singletons, so identity is enough)
+                    if typechk:  # ... and I care about types.
+                        if typeerr:
+                            raise ParameterTrackError(typemsg(key, stored, vtype, 'raise'))
                         else:
-                            self.__log__.post(typemsg(key, self._internal_pardict[key], self.__ptu__.tn, 'retain'), silent=self._pt_silent)  # since I care about types
+                            post(typemsg, silent=pt_silent, args=(key, stored, vtype, 'retain'))  # since I care about types
                     else:  # ... but I don't care about types.
-                        self._internal_pardict[key] = copy(self.__ptu__.type)  # so I'll just reset it to new type
-                        self.__log__.post(typemsg(key, self._internal_pardict[key], self.__ptu__.tn, 'reset'), silent=not self.ptverbose)
-            elif self.ptstrict:  # Key is unknown and strict mode is on.
-                if self.pterr:
-                    raise ParameterTrackError(f"Unknown parameter '{key}' in strict mode.")
-                else:
-                    self.__log__.post(f"Unknown parameter '{key}' in strict mode -- ignored.  Use 'ptadd' to add new parameters.", silent=self._pt_silent)  # always print 'ignored'
-            else:  # New parameter and not in strict mode so just set it.
-                self.__ptu__.setattr(self, key, val)
-                self._internal_pardict[key] = copy(self.__ptu__.type)
-                self.__log__.post(f"Setting new parameter {self.__ptu__.msg}", silent=not self.ptverbose)
+                        pardict[key] = vtype  # so I'll just reset it to new type
+                        post(typemsg, silent=quiet, args=(key, stored, vtype, 'reset'))
+        finally:  # (also if a type error is raised part way through)
+            self.__log__.post_batch(records)
+        for key, val in new:  # New parameter and not in strict mode so just set it.
+            self._pt_add_new(key, val, "Setting new parameter ")
 
     def ptadd(self, **kwargs):
         """
@@ -250,21 +467,47 @@ class Parameters:
             Parameters to add/replace
 
         """
+        self._pt_add_items(kwargs)
+
+    def _pt_add_items(self, kwargs):
+        """Add/replace the parameters in the dict kwargs (see ptadd), for internal callers that already have a dict."""
+        if not kwargs:  # nothing to add (or log)
+            return
         self._pt_check_init()
+        reserved = kwargs.keys() & type(self)._internal_only_all  # internal keys, found in one C-level pass
+        if not (reserved or self.ptverbose or self.__ptu__.use_units) and self._internal_pardict.keys().isdisjoint(kwargs):
+            self._pt_bulk_add(kwargs)  # all new with nothing to convert or show per key (as ptsu does, one log entry)
+            return
+        self._pt_version += 1
+        pardict, ptu, post = self._internal_pardict, self.__ptu__, self.__log__.post
+        ptu_set, ptu_post = ptu.setattr, ptu.post_msg
+        quiet, pt_silent = not self.ptverbose, self._pt_silent
         for key, val in kwargs.items():
-            if key in self._internal_only_ptvar or key in self._internal_only_ptdef:  # Internal only, so ignore.
-                self.__log__.post(f"Attempt to modify internal parameter/method '{key}' -- ignored, try 'ptsu'.", silent=self._pt_silent)  # always print 'ignored'
+            if reserved and key in reserved:  # Internal only, so ignore.
+                post("Attempt to modify internal parameter/method '{}' -- ignored, try 'ptsu'.", silent=pt_silent, args=(key,))  # always print 'ignored'
+            elif key in pardict:
+                ptu_set(self, key, val)
+                ptu_post(post, "Replacing parameter ", silent=quiet)
+                pardict[key] = ptu.type
             else:
-                action = "Replacing" if key in self._internal_pardict else "Adding"
-                self.__ptu__.setattr(self, key, val)
-                self.__log__.post(f"{action} parameter {self.__ptu__.msg}", silent=not self.ptverbose)
-                self._internal_pardict[key] = copy(self.__ptu__.type)
+                self._pt_add_new(key, val, "Adding parameter ")
+
+    def _pt_add_new(self, key, val, prefix):
+        """Add the new parameter key with its type (shared by ptadd and _pt_set), logging prefix + the set message."""
+        key = intern(key)  # stored names are interned so later lookups hit on identity
+        ptu = self.__ptu__
+        ptu.setattr(self, key, val)
+        self._internal_pardict[key] = ptu.type
+        if self._pt_sorted_keys is not None:
+            insort(self._pt_sorted_keys, key)
+        ptu.post_msg(self.__log__.post, prefix, silent=not self.ptverbose)
 
     def ptsu(self, **kwargs):
         """
         This is the only way to set internal parameters.  Other parameters are handled using ptadd.
 
-        The order is ptverbose, ptsetunits, ptnote, ptinit then others in order provided.
+        The order is ptverbose, ptsetunits, ptnote, ptinit, then other internal parameters in order provided, then the
+        remaining parameters are added together (as ptadd).
 
         Parameters
         ----------
@@ -272,38 +515,53 @@ class Parameters:
             Parameters to set in superuser mode
 
         """
+        if not kwargs:  # nothing to set (or log)
+            return
         self._pt_check_init()
+        self._pt_version += 1
         if 'ptverbose' in kwargs:
             self.ptverbose = bool(kwargs.pop('ptverbose'))
-            self.__log__.post(f"su: Setting internal parameter 'ptverbose' to <{self.ptverbose}>", silent=not self.ptverbose)
+            self.__log__.post("su: Setting internal parameter 'ptverbose' to <{}>", silent=not self.ptverbose, args=(self.ptverbose,))
         if '_pt_silent' in kwargs:
             self._pt_silent = kwargs.pop('_pt_silent')
-            self.__log__.post(f"su: Setting internal parameter '_pt_silent' to <{self._pt_silent}>", silent=not self.ptverbose)
+            self.__log__.post("su: Setting internal parameter '_pt_silent' to <{}>", silent=not self.ptverbose, args=(self._pt_silent,))
         if 'ptsetunits' in kwargs:
             self.__ptu__.handle_units(kwargs.pop('ptsetunits'))
             self.ptsetunits = self.__ptu__.use_units
-            self.__log__.post(f"su: Setting internal parameter 'ptsetunits' to <{self.ptsetunits}>", silent=not self.ptverbose)
+            self.__log__.post("su: Setting internal parameter 'ptsetunits' to <{}>", silent=not self.ptverbose, args=(self.ptsetunits,))
         if 'ptnote' in kwargs:  # always allow ptnote to be set
             self.ptnote = kwargs.pop('ptnote')
-            self.__log__.post(f"su: Setting internal parameter 'ptnote' to <{self.ptnote}>", silent=not self.ptverbose)
+            self.__log__.post("su: Setting internal parameter 'ptnote' to <{}>", silent=not self.ptverbose, args=(self.ptnote,))
         if 'ptinit' in kwargs:
             ptinit = kwargs.pop('ptinit')
             self.ptinit(ptinit=ptinit)
 
-        for key, val in kwargs.items():
-            if key in self._internal_only_ptdef:  # Internal method, so ignore.
-                self.__log__.post(f"su: Attempt to set internal method '{key}' -- ignored.", silent=self._pt_silent)  # always print 'ignored'
-            elif key in self._internal_only_ptvar: # Internal variable, so only allow bools to be set.
-                if key[0] == '_':  # private internal variable, so ignore
-                    self.__log__.post(f"su: Attempt to set internal parameter '{key}' -- ignored.", silent=self._pt_silent)  # always print 'ignored'
-                else:  # public internal variable, so only allow bools to be set
-                    if type(val) != bool:
-                        self.__log__.post(f"su: Internal parameter '{key}' must be bool -- ignored.", silent=self._pt_silent)  # always print 'ignored'
-                    else:
-                        setattr(self, key, val)
-                        self.__log__.post(f"su: Setting internal parameter '{key}' to <{val}>", silent=not self.ptverbose)
-            else:  # Add it same as ptadd
-                self.ptadd(**{key: val})
+        reserved = kwargs.keys() & type(self)._internal_only_all  # internal keys, found in one C-level pass
+        if not reserved:  # All are added same as ptadd (in one go below)
+            toadd = kwargs
+        else:
+            toadd = {key: val for key, val in kwargs.items() if key not in reserved}
+            internal_def = type(self)._internal_only_ptdef
+            post, quiet, pt_silent = self.__log__.post, not self.ptverbose, self._pt_silent
+            for key, val in kwargs.items():
+                if key not in reserved:
+                    continue
+                if key in internal_def:  # Internal method, so ignore.
+                    post("su: Attempt to set internal method '{}' -- ignored.", silent=pt_silent, args=(key,))  # always print 'ignored'
+                elif key.startswith('_'):  # private internal variable, so ignore
+                    post("su: Attempt to set internal parameter '{}' -- ignored.", silent=pt_silent, args=(key,))  # always print 'ignored'
+                elif type(val) is not bool:  # public internal variable, so only allow bools to be set
+                    post("su: Internal parameter '{}' must be bool -- ignored.", silent=pt_silent, args=(key,))  # always print 'ignored'
+                else:
+                    setattr(self, key, val)
+                    post("su: Setting internal parameter '{}' to <{}>", silent=quiet, args=(key, val))
+        if toadd:
+            if type(self).ptadd is not Parameters.ptadd:  # redefined in a subclass, so go through it
+                self.ptadd(**toadd)
+            elif self.ptverbose or self.__ptu__.use_units:
+                self._pt_add_items(toadd)
+            else:
+                self._pt_bulk_add(toadd)
 
     def ptget(self, key, default=ParameterTrackError):
         """
@@ -317,7 +575,9 @@ class Parameters:
             Default value to return if parameter not found, if not provided, then raise ParameterTrackError
         
         """
-        if key in self._internal_pardict or key in self._internal_only_ptvar:
+        if key in self._internal_pardict:
+            return getattr(self, key)
+        if key in self._internal_only_ptvar:
             return getattr(self, key)
         if default is ParameterTrackError:
             raise ParameterTrackError(f"Parameter '{key}' not found.")
@@ -333,23 +593,33 @@ class Parameters:
             Parameter names to delete
 
         """
+        self._pt_version += 1
+        internal = type(self)._internal_only_all
+        pardict, sorted_keys = self._internal_pardict, self._pt_sorted_keys  # (looked up once)
+        post, quiet, pt_silent = self.__log__.post, not self.ptverbose, self._pt_silent
         for kval in args:
             if isinstance(kval, str):
                 keys = [x.strip() for x in kval.split(',')]
             elif isinstance(kval, list):
                 keys = kval
             else:
-                self.__log__.post(f"Parameter names to delete must be strings or lists, got <{kval}> ({tn(kval)})", silent=self._pt_silent)  # always print 'ignored'
+                post(f"Parameter names to delete must be strings or lists, got <{kval}> ({tn(kval)})", silent=pt_silent)  # always print 'ignored'
                 continue
             for k in keys:
-                if k in self._internal_only_ptvar or k in self._internal_only_ptdef:
-                    self.__log__.post(f"Attempt to delete internal parameter/method '{k}' -- ignored.", silent=self._pt_silent)  # always print 'ignored'
-                elif k in self._internal_pardict:
-                    self.__log__.post(f"Deleted parameter '{k}' which had value <{getattr(self, k)}>", silent=not self.ptverbose)
+                if k in internal:
+                    post("Attempt to delete internal parameter/method '{}' -- ignored.", silent=pt_silent, args=(k,))  # always print 'ignored'
+                elif k in pardict:
+                    val = getattr(self, k)
                     delattr(self, k)
-                    del self._internal_pardict[k]
+                    if type(val) in _IMMUTABLE_TYPES:  # can't change before the log reads it, so format it then
+                        post("Deleted parameter '{}' which had value <{}>", silent=quiet, args=(k, val))
+                    else:
+                        post(f"Deleted parameter '{k}' which had value <{val}>", silent=quiet)
+                    del pardict[k]
+                    if sorted_keys is not None:
+                        sorted_keys.remove(k)
                 else:
-                    self.__log__.post(f"Attempt to delete unknown parameter '{k}' -- ignored.", silent=self._pt_silent)  # always print 'ignored'
+                    post("Attempt to delete unknown parameter '{}' -- ignored.", silent=pt_silent, args=(k,))  # always print 'ignored'
 
     def ptshow(self, show_all=False, return_only=False, include_par=None):
         """
@@ -372,16 +642,15 @@ class Parameters:
             string representation of the current parameters
 
         """
-        show = f"Parameter Tracking: {self.ptnote}\n"
-        show += '-'*(len(show)-1) + "\n"
-        show += self.pt_to_dict(serialize='yaml', include_par=include_par, what_to_dict="parameters")
+        title = f"Parameter Tracking: {self.ptnote}"
+        parts = [title, "\n", '-'*len(title), "\n",
+                 self.pt_to_dict(serialize='yaml', include_par=include_par, what_to_dict="parameters")]
         if show_all:
-            show += "\nParameter types:\n"
-            show += '-'*len("Parameter types:") + "\n"
-            show += self.pt_to_dict(serialize='yaml', include_par=include_par, what_to_dict="types")
-            show += "\nInternal parameters:\n"
-            show += '-'*len("Internal parameters:") + "\n"
-            show += self.pt_to_dict(serialize='yaml', what_to_dict="internal")
+            parts.extend(["\nParameter types:\n", '-'*len("Parameter types:"), "\n",
+                          self.pt_to_dict(serialize='yaml', include_par=include_par, what_to_dict="types"),
+                          "\nInternal parameters:\n", '-'*len("Internal parameters:"), "\n",
+                          self.pt_to_dict(serialize='yaml', what_to_dict="internal")])
+        show = ''.join(parts)
         if return_only:
             return show
         self.__log__.post(show, silent=False)
@@ -410,9 +679,9 @@ class Parameters:
         elif action == 'dump':
             self.__log__.post("Dumping log to 'param_track_log.txt'/'param_track_units_log.txt'", silent=False)
             with open('param_track_log.txt', 'w') as fp:
-                self.__log__.show(file=fp, search=search)
+                fp.write(self.__log__.to_string(search=search))
             with open('param_track_units_log.txt', 'w') as fp:
-                self.__ptu__.__log__.log.show(file=fp, search=search)
+                fp.write(self.__ptu__.__log__.to_string(search=search))
         else:
             self.__log__.post(f"Unknown 'ptlog' action '{action}'.", silent=False)
 
@@ -438,30 +707,79 @@ class Parameters:
             Dictionary or serialized form of current parameters
 
         """
-        rec = {}
-        if what_to_dict[0].lower() == "i":  # internal parameters only
-            include_par = [x for x in self._internal_only_ptvar if x[0]!= '_']
-        else: # normal parameters or types
-            include_par = list(self._internal_pardict.keys()) if include_par is None else include_par
-            if isinstance(include_par, str):
-                include_par = [x.strip() for x in include_par.split(',')]
-        for key in include_par:
-            if key not in self._internal_pardict and key not in self._internal_only_ptvar:  # if key is unknown, ignore it and print warning
-                self.__log__.post(f"Parameter '{key}' not found in parameter tracking -- ignored in output.", silent=self._pt_silent)  # always print 'ignored'
-                continue
-            val = self._internal_pardict.get(key) if what_to_dict[0].lower() == 't' else self.ptget(key, None)
-            rec[key] = check_serialize(serialize, val)
+        what = what_to_dict[0].lower()
+        if serialize is None and include_par is None and what == 'p':  # plain values, no checks
+            return {key: getattr(self, key) for key in self._internal_pardict}
+        cache_name = None
+        if serialize in ('json', 'yaml') and what in ('p', 't'):  # shown/logged repeatedly
+            if include_par is None:
+                cache_name = (serialize, what)
+            else:  # a subset is cached as long as it is all tracked parameters (unknown ones are logged each time)
+                if isinstance(include_par, str):
+                    include_par = [x.strip() for x in include_par.split(',')]
+                include_par = tuple(include_par)
+                pardict = self._internal_pardict
+                if all(key in pardict for key in include_par):
+                    cache_name = (serialize, what, include_par)
+        if cache_name is not None:
+            state, output = self._pt_cached(cache_name)
+            if output is not None:
+                return output
+        rec = self._pt_to_safe_dict(serialize=serialize, include_par=include_par, what_to_dict=what_to_dict)
         if serialize == 'json':
-            import json
-            return json.dumps(rec, indent=4)
+            output = json.dumps(rec, indent=4)
         elif serialize == 'yaml':
-            import yaml
-            return yaml.dump(rec)
+            if yaml is None:
+                raise ParameterTrackError("PyYAML is required for serialize='yaml'.")
+            presorted = include_par is None or what == "i"  # _pt_sorted_keys/_internal_only_shown
+            if not presorted:
+                rec = dict(sorted(rec.items()))
+            output = yaml_plain_dump(rec)
+            if output is None:
+                output = yaml.dump(rec, Dumper=_YAML_DUMPER, sort_keys=False)
         elif serialize == 'pickle':
-            import pickle
             return pickle.dumps(rec)
-        return rec
-    
+        else:
+            return rec
+        if cache_name is not None:
+            self._pt_store_cached(cache_name, state, output)
+        return output
+
+    def _pt_to_safe_dict(self, serialize=None, include_par=None, what_to_dict="parameters"):
+        """
+        Return the requested dictionary with values made safe for 'serialize' (see pt_to_dict), but not serialized.
+
+        For serialize='yaml' and all parameters (or the internal ones) it is built in sorted key order.
+
+        """
+        what = what_to_dict[0].lower()
+        if what == "i":  # internal parameters only (all slotted, so read as attributes)
+            return {key: check_serialize(serialize, getattr(self, key)) for key in self._internal_only_shown}
+        pardict = self._internal_pardict
+        if include_par is None: # all normal parameters or types
+            if serialize == 'yaml':
+                if self._pt_sorted_keys is None:  # first sorted output, from here on it is kept sorted
+                    self._pt_sorted_keys = sorted(pardict)
+                include_par = self._pt_sorted_keys
+            else:
+                include_par = pardict  # iterated directly, nothing below changes it
+        else: # requested normal parameters or types
+            if isinstance(include_par, str):
+                include_par = [x.strip() for x in include_par.split(',')]
+            internal_var, known = type(self)._internal_only_ptvar, []
+            for key in include_par:
+                if key in pardict or key in internal_var:
+                    known.append(key)
+                else:  # if key is unknown, ignore it and print warning
+                    self.__log__.post("Parameter '{}' not found in parameter tracking -- ignored in output.", silent=self._pt_silent, args=(key,))  # always print 'ignored'
+            include_par = known
+        _cs, _getattr = check_serialize, getattr  # the rest is one comprehension, with these bound locally
+        if what == 't':
+            if include_par is pardict:  # key and type in one step
+                return {key: _cs(serialize, vtype) for key, vtype in pardict.items()}
+            return {key: _cs(serialize, pardict.get(key)) for key in include_par}
+        return {key: _cs(serialize, _getattr(self, key, None)) for key in include_par}
+
     def ptfrom(self, filename, use_key=None, use_option='add', as_row=False):
         """
         Set parameters from a file, depending on the format of the file.
@@ -483,13 +801,12 @@ class Parameters:
             and first line is header (works since row 0 is header)
 
         """
-        from param_track.param_track_io import from_file
         self.__log__.post(f"{'Adding' if use_option == 'add' else 'Setting'} parameters from {filename}{' with key ' + use_key if use_key else ''}", silent=not self.ptverbose)
         if as_row:
             if filename.endswith('.csv'):
                 self.__log__.post("Using 'as_row' option.", silent=self.ptverbose)
             else:
-                self.__log__.post(f"Warning: 'as_row' option is only applicable for CSV files, ignoring 'as_row' for {filename}", silent=self._pt_silent)  # always print 'ignored'
+                self.__log__.post("Warning: 'as_row' option is only applicable for CSV files, ignoring 'as_row' for {}", silent=self._pt_silent, args=(filename,))  # always print 'ignored'
         data, unit_handler = from_file(filename, use_key=use_key, as_row=as_row)
         if isinstance(unit_handler, dict) and len(unit_handler) > 0:
             self.ptsu(ptsetunits=unit_handler)
@@ -512,6 +829,5 @@ class Parameters:
         if include_par == 'unit_handler':
             self.__ptu__.save_unit_handler(filename=filename)
         else:
-            from param_track.param_track_io import to_file
             self.__log__.post(f"Writing to file {filename}")
             to_file(self, filename=filename, include_par=include_par, as_row=as_row)
\ No newline at end of file
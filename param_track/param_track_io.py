@@ -1,4 +1,12 @@
-from param_track.param_track_support import ParameterTrackError
+from param_track.param_track_support import ParameterTrackError, _YAML_LOADER
+import csv
+import io
+from itertools import islice
+import json
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
 def to_file(data, filename, include_par=None, as_row=False):
     if filename.endswith('.csv'):
@@ -17,10 +25,8 @@ def _to_npz(data, filename, include_par=None):
 
 def _to_json_yaml(data, filename, include_par=None):
     if filename.endswith('.json'):
-        import json
         this = data.pt_to_dict(serialize='json', include_par=include_par, what_to_dict='parameters')
-    elif filename.endswith('.yaml'):
-        import yaml
+    elif filename.endswith('.yaml') or filename.endswith('.yml'):
         this = data.pt_to_dict(serialize='yaml', include_par=include_par, what_to_dict='parameters')
     with open(filename, 'w') as fp:
         fp.write(this)
@@ -46,29 +52,26 @@ def _to_csv(data, filename=None, include_par=None, as_row=False, include_header=
         CSV string of current parameters
 
     """
-    import csv
-    import io
-    import json
-    
-    this = data.pt_to_dict(serialize='json', include_par=include_par, what_to_dict='parameters')
+    this = data._pt_to_safe_dict(serialize='json', include_par=include_par, what_to_dict='parameters')
 
     buf = io.StringIO()
     writer = csv.writer(buf)
 
-    if as_row:
+    if as_row:  # csv takes any iterable, so write the dict views directly
         if include_header:
-            writer.writerow([key for key, val in json.loads(this).items()])
-        writer.writerow([val for key, val in json.loads(this).items()])
+            writer.writerow(this.keys())
+        writer.writerow(this.values())
     else:
         if include_header:
             writer.writerow(['parameter', 'value'])
-        writer.writerows([[key, val] for key, val in json.loads(this).items()])
+        writer.writerows(this.items())
 
+    output = buf.getvalue()
     if filename is None:
-        return buf.getvalue()
+        return output
     else:
         with open(filename, 'w') as f:
-            f.write(buf.getvalue())
+            f.write(output)
 
 def from_file(filename, as_row=False, use_key=None):
     """
@@ -132,7 +135,6 @@ def _from_npz(filename, use_key=None):
 def _from_csv(filename, as_row=False):
     """Set parameters from a CSV file (see from_file)."""
     print("Units not currently supported for CSV input.")
-    import csv
     if as_row:
         as_row = int(as_row)
     data = {}
@@ -141,29 +143,23 @@ def _from_csv(filename, as_row=False):
         reader = csv.reader(fp)
         if as_row:
             keys = next(reader)
-        for i, row in enumerate(reader):
-            if as_row:
-                if i != as_row-1:
-                    continue
-                for key, val in zip(keys, row):
-                    data[key] = val
-                break
-            else:
-                if len(row) != 2:
-                    continue
-                key, val = row
-                data[key] = val
+            if as_row > 0:  # skip straight to row 'as_row' (row 0 is the header)
+                row = next(islice(reader, as_row - 1, None), None)
+                if row is not None:
+                    data = dict(zip(keys, row))
+        else:
+            data = {row[0]: row[1] for row in reader if len(row) == 2}
     return data, units
 
 def _from_json_yaml(filename, use_key=None):
     """Set parameters from a JSON or YAML file (see from_file)."""
     with open(filename, 'r') as fp:
         if filename.endswith('.json'):
-            import json
             data1 = json.load(fp)
         elif filename.endswith('.yaml') or filename.endswith('.yml'):
-            import yaml
-            data1 = yaml.safe_load(fp)
+            if yaml is None:
+                raise ParameterTrackError(f"PyYAML is required to read {filename}.")
+            data1 = yaml.load(fp, Loader=_YAML_LOADER)  # (safe_load, via libyaml if available)
     data = {}
     units = {}
     if use_key is not None and use_key not in data1:
@@ -2,6 +2,16 @@
 # Copyright 2025 David R DeBoer
 # Licensed under the MIT license. See LICENSE file in the project root for details.
 from datetime import datetime
+import json
+import re
+try:
+    import yaml
+    # picked once: yaml.dump's own Dumper (CDumper writes some values differently, e.g. complex without quotes),
+    # and the libyaml-backed safe loader when available (same result as safe_load)
+    _YAML_DUMPER = yaml.Dumper
+    _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    yaml = _YAML_DUMPER = _YAML_LOADER = None
 try:
     from astropy.time import Time, TimeDelta
     from astropy.units import Quantity
@@ -9,6 +19,16 @@ except ImportError:
     pass
 
 
+_IMMUTABLE_TYPES = {int, float, complex, str, bytes, bool, type(None)}  # values that can't change in place
+_DATA_DESCRIPTORS = {}  # class -> data_descriptors(class)
+_EQUAL_SAME_TYPES = {int, str, bytes, bool}  # immutable, and == means the same value (not so for 0.0 == -0.0)
+_SERIALIZE_OK_TYPES = {int, float, str, bool, type(None)}  # serialize as-is to json/yaml, no probe needed
+_JSON_PROBED_TYPES = {}  # type -> json probe passed (json decides by type for non-containers), so it runs once per type
+_YAML_PLAIN_STR = re.compile(r'[A-Za-z_][A-Za-z0-9_]{0,63}').fullmatch  # yaml.dump leaves these unquoted...
+_YAML_RESERVED = {'yes', 'no', 'true', 'false', 'on', 'off', 'null'}  # ...unless they read as bool/null
+_YAML_SCALARS = {True: 'true', False: 'false', None: 'null'}
+
+
 class ParameterTrackError(Exception):
     """Parameter track exception handling."""
     def __init__(self, message):
@@ -16,12 +36,31 @@ class ParameterTrackError(Exception):
 
 
 class LogEntry:
-    """A single parameter track log entry."""
-    def __init__(self, module, message, silent):
-        self.time = datetime.now()
+    """A single parameter track log entry (if args are given, message is formatted with/called on them on first use)."""
+    __slots__ = ('time', 'module', 'silent', '_message', '_args')  # one is made per post, so keep them small
+
+    def __init__(self, module, message, silent, args=(), time=None):
+        self.time = datetime.now() if time is None else time
         self.module = module
         self.silent = silent
-        self.message = message
+        self._message = message
+        self._args = args
+
+    def __getstate__(self):
+        """Pickle state: the slots (there is no __dict__, so spelled out for pickle protocols 0 and 1)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, val in state.items():
+            setattr(self, name, val)
+
+    @property
+    def message(self):
+        if self._args:
+            template = self._message
+            self._message = template(*self._args) if callable(template) else template.format(*self._args)
+            self._args = ()
+        return self._message
 
     def __str__(self):
         return f"{self.module}  --  {self.time}  --  {self.message}"
@@ -33,20 +72,66 @@ class Log:
         self.module = module
         self.log = []
 
-    def post(self, message, silent=False):
-        self.log.append(LogEntry(self.module, message, silent))
+    def post(self, message, silent=False, args=()):
+        """
+        Add a message to the log and print it unless silent.
+
+        If args are supplied, message is a str.format template (or a callable returning the str) that is only
+        filled in (called) with them when the entry is printed or read, so silent posts don't pay for the formatting.
+
+        """
+        entry = LogEntry(self.module, message, silent, args)
+        self.log.append(entry)
         if not silent:
-            print(message)
+            print(entry.message)
 
-    def show(self, file=None, search=None):
+    def extend(self, message, args_list, silent=False):
+        """
+        Add one entry per args in args_list, each the message template filled in with those args (see post).
+
+        The entries share one timestamp, for loops posting the same message for many keys.
+
+        """
+        self.post_batch([(message, args, silent) for args in args_list])
+
+    def post_batch(self, records):
+        """
+        Add the (message, args, silent) records (each as for post) to the log, sharing one timestamp.
+
+        For loops that collect their posts and hand them over in one go.
+
+        """
+        now = datetime.now()
+        module, log = self.module, self.log
+        for message, args, silent in records:
+            entry = LogEntry(module, message, silent, args, now)
+            log.append(entry)
+            if not silent:
+                print(entry.message)
+
+    def to_string(self, search=None):
+        """Return what show prints (the header and the entries, only those containing search if given) as one str."""
         hdr = f"Log: {self.module}"
-        print(hdr, file=file)
-        print("-" * len(hdr), file=file)
-        for entry in self.log:
-            if search is None:
-                print(entry, file=file)
-            elif search in entry.message:
-                print(entry, file=file)
+        lines = [hdr, "-" * len(hdr)]
+        lines.extend(str(entry) for entry in self.log if search is None or search in entry.message)
+        return '\n'.join(lines) + '\n'
+
+    def show(self, file=None, search=None):
+        print(self.to_string(search=search), end='', file=file)  # one write, also for files
+
+def data_descriptors(cls):
+    """Names cls (or a base) defines as data descriptors (e.g. properties), which must be set with setattr."""
+    names = _DATA_DESCRIPTORS.get(cls)
+    if names is None:  # walked once per class
+        names = set()
+        for klass in reversed(cls.__mro__):  # (so a subclass' plain attribute overrides a base's descriptor)
+            for name, attr in vars(klass).items():
+                if hasattr(type(attr), '__set__') or hasattr(type(attr), '__delete__'):
+                    names.add(name)
+                else:
+                    names.discard(name)
+        names = _DATA_DESCRIPTORS[cls] = frozenset(names)
+    return names
 
 def typename(val):
     if isinstance(val, type):
@@ -61,6 +146,9 @@ def typemsg(key, oldt, newt, action):
         msg += f" -- resetting to <{typename(newt)}>."
     return msg
 
+def keysmsg(prefix, keys):
+    return prefix + ', '.join(keys)
+
 def write_to_clipboard(output):
     """ Write output string to clipboard (macOS only). """
     import platform
@@ -73,37 +161,95 @@ def write_to_clipboard(output):
         print(f"Clipboard writing not supported on {platform.system()}")
         print(output)
 
-def check_serialize(serialize, val):
-    if serialize is None or serialize == 'pickle':
+def _serialize_text(serialize, val):
+    """Return val in a form that can be json or yaml serialized (see check_serialize)."""
+    vtype = type(val)
+    if vtype in _SERIALIZE_OK_TYPES:
         return val
-
-    if serialize == 'json' or serialize == 'yaml':
-        if isinstance(val, datetime):
-            return val.isoformat()
-        if isinstance(val, Time):
-            return val.isot
-        if isinstance(val, TimeDelta):
-            return f"{float(val.to_value('sec'))} sec"
-        if isinstance(val, Quantity):
-            return val.to_string()
-        if isinstance(val, type):
-            return val.__name__
-        if isinstance(val, (list, tuple, set)):
-            return [check_serialize(serialize, v) for v in val]
-        if isinstance(val, dict):
-            return {k: check_serialize(serialize, v) for k, v in val.items()}
-        try:
-            if serialize == 'json':
-                import json
-                _ = json.dumps({'check': val})
-            elif serialize == 'yaml':
-                import yaml
-                _ = yaml.dump({'check': val})
-        except TypeError:
-            val = str(val)
+    if vtype is type:
+        return val.__name__
+    if vtype is list or vtype is tuple or vtype is set:
+        return [_serialize_text(serialize, v) for v in val]
+    if vtype is dict:
+        return _serialize_dict(serialize, val)
+    if isinstance(val, datetime):
+        return val.isoformat()
+    if isinstance(val, Time):
+        return val.isot
+    if isinstance(val, TimeDelta):
+        return f"{float(val.to_value('sec'))} sec"
+    if isinstance(val, Quantity):
+        return val.to_string()
+    if isinstance(val, type):
+        return val.__name__
+    if isinstance(val, (list, tuple, set)):
+        return [_serialize_text(serialize, v) for v in val]
+    if isinstance(val, dict):
+        return _serialize_dict(serialize, val)
+    if serialize == 'json':
+        ok = _JSON_PROBED_TYPES.get(vtype)
+        if ok is None:
+            try:
+                _ = json.dumps(val)
+                ok = True
+            except TypeError:
+                ok = False
+            _JSON_PROBED_TYPES[vtype] = ok
+        return val if ok else str(val)
+    try:
+        if serialize == 'yaml':
+            _ = yaml.dump(val, Dumper=_YAML_DUMPER)
+    except TypeError:
+        val = str(val)
     # Finally, just hope...
     return val
 
+def yaml_plain_dump(rec):
+    """
+    Return what yaml.dump(rec, sort_keys=False) would for a flat dict of identifier-like str/int/bool/None, else None.
+
+    These are the common case for ptshow/__repr__, and writing the lines directly skips the PyYAML emitter.
+
+    """
+    if not rec:
+        return None
+    lines = []
+    for key, val in rec.items():
+        if type(key) is not str or not _YAML_PLAIN_STR(key) or key.lower() in _YAML_RESERVED:
+            return None
+        vtype = type(val)
+        if vtype is str:
+            if not _YAML_PLAIN_STR(val) or val.lower() in _YAML_RESERVED:
+                return None
+        elif vtype is int:
+            val = str(val)
+        elif vtype is bool or val is None:
+            val = _YAML_SCALARS[val]
+        else:
+            return None
+        lines.append(f"{key}: {val}\n")
+    return ''.join(lines)
+
+def _json_key(key):
+    """The str json writes for the dict key (None/bool/int/float keys are converted, others are left as is)."""
+    if type(key) is str or not (key is None or isinstance(key, (int, float))):
+        return key
+    return json.dumps(key)
+
+def _serialize_dict(serialize, val):
+    """Dict part of _serialize_text (for json, keys become the str json would write, as after a dumps/loads)."""
+    if serialize == 'json':
+        return {_json_key(k): _serialize_text(serialize, v) for k, v in val.items()}
+    return {k: _serialize_text(serialize, v) for k, v in val.items()}
+
+_SERIALIZE_HANDLERS = {'json': _serialize_text, 'yaml': _serialize_text}  # None, 'pickle' (or other) pass through
+
+def check_serialize(serialize, val):
+    handler = _SERIALIZE_HANDLERS.get(serialize)
+    if handler is None:
+        return val
+    return handler(serialize, val)
+
 def listify(x, d={}, sep=',', NoneReturn=[], dtype=None):
     """
     Convert input to list in creative ways.  (Taken from odsutils.ods_tools.listify)
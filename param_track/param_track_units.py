@@ -1,8 +1,14 @@
 from astropy import units as u
 from param_track.param_track_timetools import TUNITS, interpret_date
 from .param_track_support import Log
-from .param_track_support import listify, typename
+from .param_track_support import listify, typename, _IMMUTABLE_TYPES
 from copy import copy
+from os.path import isfile
+import json
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
 
 builtin_units = {  # Not units, but included
@@ -51,7 +57,29 @@ all_units = list(builtin_units.keys()) + list(time_units.keys()) + \
             list(timedelta_units.keys()) + list(astropy_units.keys()) + \
             ['*']
 
+def setmsg(prefix, key, val, vtype, oldval, oldtype):
+    """Message describing setting key to val (see Units.msg)."""
+    msg = f"{prefix}'{key}' to <{val}> ({'None' if vtype is None else typename(val)})"
+    if oldval is not None:
+        msg += f" [was <{oldval}>"
+        if oldtype is not None:
+            msg += f" ({typename(oldtype)})"
+        msg += "]"
+    return msg
+
 class Units:
+    # setattr writes the per-call state (key, val, type, ...) for every parameter set, so keep it in slots
+    __slots__ = ('module', 'use_units', 'unit_handler', 'valid_unit_handler', '__log__',
+                 'key', 'oldval', 'oldtype', 'val', 'type')
+
+    def __getstate__(self):
+        """Pickle state: the set slots (there is no __dict__, so spelled out for pickle protocols 0 and 1)."""
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name, val in state.items():
+            setattr(self, name, val)
+
     def __init__(self, module):
         self.module = module
         self.use_units = False
@@ -100,7 +128,6 @@ class Units:
             self.use_units = True
             self._parse_unit_handler(unit_handler, action=action)
         elif isinstance(unit_handler, str):
-            from os.path import isfile
             if isfile(unit_handler):
                 self.use_units = True
                 self.load_unit_handler(filename=unit_handler, action=action)
@@ -153,7 +180,8 @@ class Units:
         self.valid_unit_handler = True
 
     def setattr(self, obj, key, val):
-        self.oldval = copy(getattr(obj, key, None))
+        self.key = key
+        self.oldval = getattr(obj, key, None)  # reference only, used for the message
         self.oldtype = obj._internal_pardict.get(key, None)
         if not self.use_units:
             self.val = val
@@ -164,14 +192,30 @@ class Units:
         else:
             self.val = val
         self.type = None if self.val is None else type(self.val)
-        self.tn = 'None' if self.type is None else typename(self.val)
         setattr(obj, key, self.val)
-        self.msg = f"'{key}' to <{self.val}> ({self.tn})"
-        if self.oldval is not None:
-            self.msg += f" [was <{self.oldval}>"
-            if self.oldtype is not None:
-                self.msg += f" ({typename(self.oldtype)})"
-            self.msg += "]"
+
+    @property
+    def tn(self):
+        """Type name of the last set value (only computed when needed)."""
+        return 'None' if self.type is None else typename(self.val)
+
+    @property
+    def msg(self):
+        """Message describing the last set value (only built when needed)."""
+        return setmsg('', self.key, self.val, self.type, self.oldval, self.oldtype)
+
+    def post_msg(self, post, prefix, silent):
+        """
+        Post prefix + msg with post (a Log.post).
+
+        If silent and the values are immutable (so can't change before it is read), the message is left to the log
+        to build if ever needed.
+
+        """
+        if silent and type(self.val) in _IMMUTABLE_TYPES and type(self.oldval) in _IMMUTABLE_TYPES:
+            post(setmsg, silent=True, args=(prefix, self.key, self.val, self.type, self.oldval, self.oldtype))
+        else:
+            post(prefix + self.msg, silent=silent)
 
     def _make_quantity(self, key, val):
         unit = self.unit_handler[key]['type']
@@ -223,11 +267,11 @@ class Units:
 
         """
         if filename.endswith('.json'):
-            import json
             with open(filename, 'w') as fp:
                 json.dump(self.unit_handler, fp)
         elif filename.endswith('.yaml') or filename.endswith('yml'):
-            import yaml
+            if yaml is None:
+                raise ImportError(f"PyYAML is required to write {filename}.")
             with open(filename, 'w') as fp:
                 yaml.dump(self.unit_handler, fp)
 
@@ -239,11 +283,11 @@ class Units:
 
         """
         if filename.endswith('.json'):
-            import json
             with open(filename, 'r') as fp:
                 unit_handler = json.load(fp)
         elif filename.endswith('.yaml') or filename.endswith('yml'):
-            import yaml
+            if yaml is None:
+                raise ImportError(f"PyYAML is required to read {filename}.")
             with open(filename, 'r') as fp:
                 unit_handler = yaml.safe_load(fp)
         self._parse_unit_handler(unit_handler=unit_handler, action=action)
\ No newline at end of file
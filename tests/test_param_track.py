@@ -0,0 +1,47 @@
+import contextlib
+import io
+import unittest
+
+from param_track import Parameters
+
+
+def _printed(func, *args, **kwargs):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        func(*args, **kwargs)
+    return out.getvalue().splitlines()
+
+
+def _make(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):  # don't show the initialization messages
+        return Parameters(**kwargs)
+
+
+class TestPtsetUnchanged(unittest.TestCase):
+
+    def test_unchanged_value_is_skipped_and_reported(self):
+        p = _make(ptverbose=True, a=1, b='x')
+        self.assertEqual(_printed(p.ptset, a=1), ["Parameter 'a' unchanged."])
+        self.assertEqual(_printed(p.ptset, b='x'), ["Parameter 'b' unchanged."])
+        self.assertIn("Parameter 'a' unchanged.", p.__log__.to_string())
+
+    def test_unchanged_in_multi_key_set(self):
+        p = _make(ptverbose=True, a=1, b='x')
+        printed = _printed(p.ptset, a=1, b='y')
+        self.assertEqual(printed[0], "Parameter 'a' unchanged.")
+        self.assertTrue(printed[1].startswith("Setting existing parameter 'b' to <y>"))
+
+    def test_changed_value_or_type_is_set(self):
+        p = _make(ptverbose=True, a=1)
+        self.assertTrue(_printed(p.ptset, a=2)[0].startswith("Setting existing parameter 'a' to <2>"))
+        self.assertTrue(_printed(p.ptset, a=2.0)[0].startswith("Setting existing parameter 'a' to <2.0>"))
+        self.assertEqual(p.a, 2.0)
+
+    def test_unchanged_not_printed_when_quiet(self):
+        p = _make(ptverbose=False, a=1)
+        self.assertEqual(_printed(p.ptset, a=1), [])
+        self.assertIn("Parameter 'a' unchanged.", p.__log__.to_string())
+
+
+if __name__ == '__main__':
+    unittest.main()